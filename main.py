@@ -1,10 +1,19 @@
 #!/usr/bin/env python3
-import os, json, time, random, urllib.request, urllib.error, argparse
-from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Tuple, Optional
+import os, csv, json, random, shutil, signal, argparse, asyncio, atexit, itertools, tempfile
+from contextlib import contextmanager
+from functools import lru_cache
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Tuple, Optional, Set
 
+import aiohttp  # pip install aiohttp
 import mysql.connector  # pip install mysql-connector-python
 
+try:
+    import orjson  # pip install orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv  # pip install python-dotenv
@@ -17,12 +26,29 @@ API_BASE_URL = "https://data.api.drift.trade/market"
 MARKETS = ["SOL-PERP", "BTC-PERP", "ETH-PERP"]
 
 # Fetch cadence / backoff
-REQUEST_DELAY_SECONDS = 0.20
+REQUESTS_PER_SECOND = 5.0   # aggregate request rate across all markets
 MAX_API_RETRIES = 3
 TIMEOUT_SECS = 20
 BAN_SLEEP_FALLBACK = 65     # if Retry-After header absent
 DEFAULT_LOOKBACK_DAYS = 30
+FETCH_CONCURRENCY = 8       # in-flight requests to the API at once
+CONNECTOR_LIMIT = 32        # total pooled sockets
+KEEPALIVE_TIMEOUT = 75
+MAX_PAYLOAD_BYTES = 5 * 1024 * 1024  # a full day is a few KB; anything this big is bogus
 SLEEP_BETWEEN_FULL_PASSES = 300
+UPSERT_FLUSH_ROWS = 10_000  # rows buffered before calling upsert_rows
+INSERT_CHUNK_ROWS = 1_000   # rows per prepared multi-row INSERT (5 placeholders/row, limit 65535)
+COMMIT_EVERY_ROWS = 50_000  # commit boundary inside a pass's transaction
+WRITE_QUEUE_SIZE = 64       # parsed day-batches buffered ahead of the DB writer
+
+# Server-side tuning for large backfills (my.cnf, [mysqld]); each commit flushes the
+# redo log, so fewer, larger commits plus room in the log/buffer pool matter most:
+#   innodb_buffer_pool_size  = 50-70% of RAM
+#   innodb_redo_log_capacity = 4G    # MySQL >= 8.0.30; older servers: innodb_log_file_size=4G
+
+# Annualized APR in percent = APR_K * fundingRate / oraclePriceTwap, folded from
+# 24 * 365.25 * 100_000 * (fundingRate / 1e9) / (oraclePriceTwap / 1e6)
+APR_K = 24 * 365.25 * 100
 
 # MySQL connection (TCP/IP) - Load from environment variables
 MYSQL_HOST = os.getenv("MYSQL_HOST")
@@ -37,32 +63,145 @@ if not all([MYSQL_HOST, MYSQL_DB, MYSQL_USER]):
 if not MYSQL_PASS:
     print("Warning: MYSQL_PASSWORD is empty")
 
-_stop = False
+# Newest committed ts per market, kept across passes so continuous mode skips the
+# MAX(time) query; seeded from the DB on the first pass, advanced after each commit
+LATEST: Dict[str, int] = {}
+
+def _merge_latest(into: Dict[str, int], other: Dict[str, int]) -> None:
+    """Advance `into` to the per-market max of itself and `other`"""
+    for market, ts in other.items():
+        if ts > into.get(market, 0):
+            into[market] = ts
+
+@contextmanager
+def with_tx(conn):
+    """START TRANSACTION on entry, COMMIT on clean exit, ROLLBACK on error"""
+    conn.start_transaction()
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
 def _ts_utc_now_midnight():
     return datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
 
-def db_connect():
+@lru_cache(maxsize=None)
+def _load_data_dir() -> str:
+    """Private directory for bulk_load_rows' CSVs; the only place LOCAL INFILE may read"""
+    path = tempfile.mkdtemp(prefix="drift-ingestor-")
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+def db_connect(local_infile_dir: Optional[str] = None):
+    """Open a connection; pass `local_infile_dir` only for connections that run
+    bulk_load_rows, so LOAD DATA LOCAL can read from that directory and nowhere else."""
+    kwargs = {}
+    if local_infile_dir:
+        kwargs["allow_local_infile_in_path"] = local_infile_dir  # the server also needs local_infile=ON
     return mysql.connector.connect(
         host=MYSQL_HOST,
         port=MYSQL_PORT,
         user=MYSQL_USER,
         password=MYSQL_PASS,
         database=MYSQL_DB,
-        autocommit=False
+        autocommit=False,
+        time_zone="+00:00",  # TIMESTAMPs come back (and DATE()/HOUR() bucket) in UTC
+        use_pure=False,     # C extension: parameter binding/row packing off the interpreter
+        **kwargs
     )
 
-def fetch_funding_rates(market: str, date_str: str) -> List[Dict]:
+class RateLimiter:
+    """Shared gate for API requests: at most `concurrency` in flight, started at no more
+    than `rate` per second (token bucket), and held back entirely while a Retry-After
+    ban is in effect. Use as `async with limiter:` around each request."""
+
+    def __init__(self, concurrency: int, rate: float):
+        self._sem = asyncio.Semaphore(concurrency)
+        self._open = asyncio.Event()
+        self._open.set()
+        self._reopen: Optional[asyncio.TimerHandle] = None
+        self._paused_until = 0.0
+        self._rate = rate
+        self._tokens = 1.0
+        self._updated = 0.0
+        self._bucket_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "RateLimiter":
+        await self._open.wait()
+        await self._sem.acquire()
+        try:
+            await self._take_token()
+        except BaseException:
+            self._sem.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._sem.release()
+
+    async def _take_token(self) -> None:
+        loop = asyncio.get_running_loop()
+        async with self._bucket_lock:
+            while True:
+                await self._open.wait()
+                now = loop.time()
+                self._tokens = min(1.0, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self._rate)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every new request for `seconds`; extends, never shortens, a pause in effect"""
+        loop = asyncio.get_running_loop()
+        until = loop.time() + seconds
+        if until <= self._paused_until:
+            return
+        self._paused_until = until
+        self._open.clear()
+        if self._reopen is not None:
+            self._reopen.cancel()
+        self._reopen = loop.call_later(seconds, self._open.set)
+
+async def fetch_funding_rates(session: aiohttp.ClientSession, limiter: RateLimiter,
+                              market: str, date_str: str) -> List[Dict]:
     y, m, d = date_str.split("-")
     url = f"{API_BASE_URL}/{market}/fundingRates/{y}/{m}/{d}?format=json"
-    headers = {"User-Agent": "drift-funding-mysql-ingestor/1.0"}
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT_SECS)
     attempt = 1
     while True:
         try:
-            print(f"[{market}] GET {url} (attempt {attempt})")
-            req = urllib.request.Request(url, headers=headers)
-            with urllib.request.urlopen(req, timeout=TIMEOUT_SECS) as resp:
-                body = resp.read().decode("utf-8")
-                data = json.loads(body)
+            async with limiter:
+                print(f"[{market}] GET {url} (attempt {attempt})")
+                async with session.get(url, timeout=timeout) as resp:
+                    status = resp.status
+                    retry_after = resp.headers.get("Retry-After", "").strip()
+                    if status < 400:
+                        if (resp.content_length or 0) > MAX_PAYLOAD_BYTES:
+                            print(f"  -> suspiciously large payload: {resp.content_length} bytes; skipping day")
+                            return []
+                        data = json_loads(await resp.read())
+
+            if status >= 400:
+                print(f"  -> HTTPError {status} for {market} {date_str}")
+                if status in (429, 403):           # temporary ban / rate limited
+                    # Retry-After may also be an HTTP-date; only honour the delta-seconds form
+                    sleep_for = int(retry_after) if retry_after.isdigit() and int(retry_after) > 0 else BAN_SLEEP_FALLBACK
+                    print(f"  -> pausing all requests for {sleep_for}s due to ban/rate-limit")
+                    limiter.pause(sleep_for)
+                    attempt += 1
+                    continue
+                if attempt >= MAX_API_RETRIES:
+                    print("  -> giving up")
+                    return []
+                backoff = (2 ** (attempt - 1)) + random.random()
+                print(f"  -> retrying in {backoff:.2f}s")
+                await asyncio.sleep(backoff); attempt += 1
+                continue
+
             if not data.get("success", False):
                 print(f"  -> API reported failure for {market} on {date_str}")
                 return []
@@ -72,182 +211,325 @@ def fetch_funding_rates(market: str, date_str: str) -> List[Dict]:
                 return []
             return recs
 
-        except urllib.error.HTTPError as e:
-            status = e.code
-            retry_after = int(e.headers.get("Retry-After", "0") or "0")
-            print(f"  -> HTTPError {status} for {market} {date_str}")
-            if status in (429, 403):           # temporary ban / rate limited
-                sleep_for = retry_after if retry_after > 0 else BAN_SLEEP_FALLBACK
-                print(f"  -> sleeping {sleep_for}s due to ban/rate-limit")
-                time.sleep(sleep_for)
-                attempt += 1
-                continue
-            if attempt >= MAX_API_RETRIES:
-                print("  -> giving up")
-                return []
-            backoff = (2 ** (attempt - 1)) + random.random()
-            print(f"  -> retrying in {backoff:.2f}s")
-            time.sleep(backoff); attempt += 1
-
-        except (urllib.error.URLError, TimeoutError, json.JSONDecodeError) as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError) as e:
             print(f"  -> transient error: {e}")
             if attempt >= MAX_API_RETRIES:
                 print("  -> giving up")
                 return []
             backoff = (2 ** (attempt - 1)) + random.random()
             print(f"  -> retrying in {backoff:.2f}s")
-            time.sleep(backoff); attempt += 1
-
-        time.sleep(REQUEST_DELAY_SECONDS)
-
-def parse_row(r: Dict) -> Tuple[datetime, str, float, float, float]:
-    ts = int(r["ts"])
-    market = str(r["symbol"])
-    funding_rate_raw = float(r["fundingRate"])
-    oracle_price_raw = float(r["oraclePriceTwap"])
-    mark_price_raw   = float(r["markPriceTwap"])
-    if oracle_price_raw <= 0.0:
-        raise ZeroDivisionError("oraclePriceTwap <= 0")
+            await asyncio.sleep(backoff); attempt += 1
+
+def make_session() -> aiohttp.ClientSession:
+    """One pooled session for the whole process so keep-alive sockets survive across passes"""
+    connector = aiohttp.TCPConnector(limit=CONNECTOR_LIMIT, limit_per_host=FETCH_CONCURRENCY,
+                                     keepalive_timeout=KEEPALIVE_TIMEOUT)
+    # aiohttp decompresses gzip/deflate bodies transparently (auto_decompress)
+    headers = {"User-Agent": "drift-funding-mysql-ingestor/1.0", "Connection": "keep-alive",
+               "Accept-Encoding": "gzip, deflate"}
+    return aiohttp.ClientSession(connector=connector, headers=headers, auto_decompress=True)
+
+_RECORD_KEYS = frozenset(("ts", "symbol", "fundingRate", "oraclePriceTwap", "markPriceTwap"))
+
+def parse_row_safe(r: Dict) -> Optional[Tuple[int, str, float, float, float]]:
+    """Parse one API record; None if a field is missing or non-numeric, or oraclePriceTwap <= 0"""
+    if not _RECORD_KEYS <= r.keys():
+        return None
+    try:
+        ts = int(r["ts"])
+        funding_rate_raw = float(r["fundingRate"])
+        oracle_price_raw = float(r["oraclePriceTwap"])
+        mark_price_raw   = float(r["markPriceTwap"])
+    except (TypeError, ValueError):
+        return None
+    if not oracle_price_raw > 0.0:
+        return None
     # annualized APR in percent
-    funding_rate_apr = 24 * 365.25 * 100_000 * (funding_rate_raw / 1e9) / (oracle_price_raw / 1e6)
-    return (datetime.fromtimestamp(ts, tz=timezone.utc), market,
-            float(funding_rate_apr), float(oracle_price_raw), float(mark_price_raw))
+    funding_rate_apr = APR_K * funding_rate_raw / oracle_price_raw
+    return (ts, str(r["symbol"]), funding_rate_apr, oracle_price_raw, mark_price_raw)
+
+def parse_batch(recs: List[Dict]) -> List[Tuple[int, str, float, float, float]]:
+    """parse_row_safe over a day's records; bad records are dropped"""
+    rows = [parse_row_safe(r) for r in recs]
+    bad = rows.count(None)
+    if bad:
+        print(f"    -> skipping {bad} bad record(s)")
+    return [row for row in rows if row is not None]
 
 def get_latest_ts_per_market(conn) -> Dict[str, int]:
-    sql = "SELECT market, UNIX_TIMESTAMP(MAX(time)) AS latest_ts FROM funding_rates GROUP BY market"
+    # Plain MAX(time) per market resolves as a loose index scan on market_time
+    # (market, time); see sql.sql. The session runs in UTC, so the naive DATETIME
+    # is converted to unix seconds here rather than per group in MySQL.
+    sql = "SELECT market, MAX(time) AS latest FROM funding_rates GROUP BY market"
     out = {}
     with conn.cursor(dictionary=True) as cur:
         cur.execute(sql)
         for row in cur.fetchall():
-            if row["latest_ts"] is not None:
-                out[row["market"]] = int(row["latest_ts"])
+            if row["latest"] is not None:
+                out[row["market"]] = int(row["latest"].replace(tzinfo=timezone.utc).timestamp())
     return out
 
-def is_day_complete(conn, market: str, date_str: str) -> bool:
-    """Check if a specific day has sufficient data (at least 20 hours worth)"""
+def get_complete_days(conn, market: str, start: datetime, end: datetime) -> Set[str]:
+    """Return the YYYY-MM-DD days in [start, end) that have sufficient data (at least 20 hours worth)"""
     try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        start_ts = date_obj.replace(tzinfo=timezone.utc)
-        end_ts = start_ts + timedelta(days=1)
-        
+        # Consider day complete if we have data for at least 20 hours
+        # (allows for some missing data due to API issues)
         sql = """
-        SELECT COUNT(DISTINCT HOUR(time)) as hour_count 
-        FROM funding_rates 
-        WHERE market = %s 
-        AND time >= %s 
+        SELECT DATE(time) AS d, COUNT(DISTINCT HOUR(time)) AS h
+        FROM funding_rates
+        WHERE market = %s
+        AND time >= %s
         AND time < %s
+        GROUP BY DATE(time)
+        HAVING h >= 20
         """
-        
+
         with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql, (market, start_ts, end_ts))
-            result = cur.fetchone()
-            hour_count = result['hour_count'] if result else 0
-            
-            # Consider day complete if we have data for at least 20 hours
-            # (allows for some missing data due to API issues)
-            return hour_count >= 20
+            cur.execute(sql, (market, start, end))
+            return {row['d'].strftime('%Y-%m-%d') for row in cur.fetchall()}
     except Exception as e:
         print(f"  -> Error checking day completeness: {e}")
-        return False
+        return set()
 
-def upsert_rows(conn, rows: List[Tuple[datetime, str, float, float, float]]) -> int:
-    if not rows:
-        return 0
-    sql = """
+@lru_cache(maxsize=32)
+def _upsert_sql(n_rows: int) -> str:
+    # Memoized: prepared cursors only skip re-preparing when handed the *same* string
+    # object as last time (an identity check), so each size must map to one object
+    return f"""
     INSERT INTO funding_rates (time, market, funding_rate_apr, oracle_price, mark_price)
-    VALUES (%s, %s, %s, %s, %s)
+    VALUES {",".join(["(FROM_UNIXTIME(%s),%s,%s,%s,%s)"] * n_rows)}
     ON DUPLICATE KEY UPDATE
       funding_rate_apr = VALUES(funding_rate_apr),
       oracle_price     = VALUES(oracle_price),
       mark_price       = VALUES(mark_price);
     """  # VALUES() is valid in MySQL 8.x for this clause. :contentReference[oaicite:4]{index=4}
-    with conn.cursor() as cur:
-        cur.executemany(sql, rows)
-    conn.commit()
+
+UPSERT_CHUNK_SQL = _upsert_sql(INSERT_CHUNK_ROWS)
+
+@contextmanager
+def upsert_cursors(conn):
+    """Server-side prepared cursors for upsert_rows: one for full INSERT_CHUNK_ROWS chunks,
+    one for the remainder. Keep them open across flushes so each statement is parsed once."""
+    chunk_cur = conn.cursor(prepared=True)
+    rest_cur = conn.cursor(prepared=True)
+    try:
+        yield chunk_cur, rest_cur
+    finally:
+        chunk_cur.close()
+        rest_cur.close()
+
+def upsert_rows(conn, rows: List[Tuple[int, str, float, float, float]], cursors=None) -> int:
+    """Upsert `rows` (unix-seconds ts first) without committing; the caller owns the transaction.
+    Pass `cursors` from upsert_cursors() to reuse prepared statements across calls."""
+    if not rows:
+        return 0
+    if cursors is None:
+        with upsert_cursors(conn) as cursors:
+            return upsert_rows(conn, rows, cursors)
+    # Extended INSERTs instead of executemany, which can degrade to a statement per
+    # row once ON DUPLICATE KEY UPDATE is involved. Full chunks reuse one prepared
+    # statement; the remainder goes out as one smaller statement on its own cursor,
+    # re-prepared only when its size differs from that cursor's previous remainder.
+    chunk_cur, rest_cur = cursors
+    full = len(rows) - len(rows) % INSERT_CHUNK_ROWS
+    for i in range(0, full, INSERT_CHUNK_ROWS):
+        chunk_cur.execute(UPSERT_CHUNK_SQL, list(itertools.chain.from_iterable(rows[i:i + INSERT_CHUNK_ROWS])))
+    if full < len(rows):
+        rest = rows[full:]
+        rest_cur.execute(_upsert_sql(len(rest)), list(itertools.chain.from_iterable(rest)))
     return len(rows)
 
-def daterange(start_date: datetime, end_date: datetime):
-    cur = start_date
-    while cur <= end_date:
-        yield cur
-        cur += timedelta(days=1)
+def bulk_load_rows(conn, rows: List[Tuple[int, str, float, float, float]], cursors=None) -> int:
+    """Insert `rows` via LOAD DATA LOCAL INFILE without committing. Only for markets with no
+    rows yet: duplicate keys are skipped, not updated. Falls back to upsert_rows if the
+    server refuses LOCAL INFILE."""
+    if not rows:
+        return 0
+    with tempfile.NamedTemporaryFile("w", newline="", suffix=".csv", dir=_load_data_dir()) as f:
+        # csv quotes fields holding ',', '"' or newlines and doubles embedded quotes;
+        # the FIELDS clause below reads exactly that dialect (no backslash escapes)
+        csv.writer(f, lineterminator="\n").writerows(rows)
+        f.flush()
+        sql = """
+        LOAD DATA LOCAL INFILE %s INTO TABLE funding_rates
+        FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"' ESCAPED BY ''
+        LINES TERMINATED BY '\\n'
+        (@ts, market, funding_rate_apr, oracle_price, mark_price)
+        SET time = FROM_UNIXTIME(@ts)
+        """
+        try:
+            with conn.cursor() as cur:
+                cur.execute(sql, (f.name,))
+        except mysql.connector.Error as e:
+            print(f"  -> LOAD DATA LOCAL INFILE failed ({e}); falling back to upsert")
+            return upsert_rows(conn, rows, cursors)
+    return len(rows)
 
-def run_once(conn, force_start_date: Optional[datetime] = None) -> int:
-    total = 0
-    today_utc = _ts_utc_now_midnight()
-    latest = get_latest_ts_per_market(conn)
-    
-    for market in MARKETS:
-        print("=" * 80)
-        print(f"[{market}] scanning for missing days")
-        
-        if force_start_date:
-            # Backfill mode: use the forced start date
-            start_day = force_start_date
-            print(f"  BACKFILL MODE: forcing start from {force_start_date.strftime('%Y-%m-%d')}")
-        elif market in latest:
-            # Normal mode: continue from latest data
-            last_dt = datetime.fromtimestamp(latest[market], tz=timezone.utc)
-            last_day = last_dt.replace(hour=0, minute=0, second=0, microsecond=0)
-            start_day = last_day if last_day == today_utc else (last_day + timedelta(days=1))
-            print(f"  latest in DB: {last_dt.isoformat()}")
-        else:
-            # No data yet: seed with default lookback
-            start_day = today_utc - timedelta(days=DEFAULT_LOOKBACK_DAYS)
-            print(f"  no data yet; seeding last {DEFAULT_LOOKBACK_DAYS} days")
+async def process_market(session: aiohttp.ClientSession, conn, limiter: RateLimiter,
+                         queue: asyncio.Queue, market: str, latest: Dict[str, int],
+                         today_utc: datetime, force_start_date: Optional[datetime] = None) -> None:
+    """Fetch and parse every missing day for `market`, handing batches to the writer via `queue`"""
+    if force_start_date:
+        # Backfill mode: use the forced start date
+        start_day = force_start_date
+        print(f"[{market}] BACKFILL MODE: forcing start from {force_start_date.strftime('%Y-%m-%d')}")
+    elif market in latest:
+        # Normal mode: continue from latest data
+        last_dt = datetime.fromtimestamp(latest[market], tz=timezone.utc)
+        last_day = last_dt.replace(hour=0, minute=0, second=0, microsecond=0)
+        start_day = last_day if last_day == today_utc else (last_day + timedelta(days=1))
+        print(f"[{market}] latest in DB: {last_dt.isoformat()}")
+    else:
+        # No data yet: seed with default lookback
+        start_day = today_utc - timedelta(days=DEFAULT_LOOKBACK_DAYS)
+        print(f"[{market}] no data yet; seeding last {DEFAULT_LOOKBACK_DAYS} days")
 
-        if start_day > today_utc:
-            print("  up to date.")
-            continue
+    if start_day > today_utc:
+        print(f"[{market}] up to date.")
+        return
 
-        days = [d.strftime("%Y-%m-%d") for d in daterange(start_day, today_utc)]
-        
-        # In backfill mode, filter out days that are already complete
-        if force_start_date:
-            incomplete_days = []
-            for day in days:
-                if is_day_complete(conn, market, day):
-                    print(f"  -> {day} already complete, skipping")
-                else:
-                    incomplete_days.append(day)
-            days = incomplete_days
-            
-        if not days:
-            print("  all days already complete.")
-            continue
-            
-        print(f"  processing {len(days)} day(s): {days[0]} -> {days[-1]}")
-
-        # Process each day individually for immediate DB writes
-        market_total = 0
-        for i, day in enumerate(days, 1):
-            progress = f"({i}/{len(days)})"
-            print(f"  {progress} fetching {day}...")
-            recs = fetch_funding_rates(market, day)
-            
-            if not recs:
-                print(f"    -> no data returned for {day}")
-                time.sleep(REQUEST_DELAY_SECONDS + random.random() * 0.1)
-                continue
-                
-            batch = []
-            for r in recs:
-                try:
-                    batch.append(parse_row(r))
-                except (KeyError, ValueError, ZeroDivisionError) as e:
-                    print(f"    -> skipping bad record: {e}")
-            
-            if batch:
-                n = upsert_rows(conn, batch)
-                total += n
-                market_total += n
-                print(f"    -> upserted {n} rows for {day}")
+    days = [date.fromordinal(o).isoformat() for o in range(start_day.toordinal(), today_utc.toordinal() + 1)]
+
+    # In backfill mode, filter out days that are already complete
+    if force_start_date:
+        complete = get_complete_days(conn, market, start_day, today_utc + timedelta(days=1))
+        incomplete_days = []
+        for day in days:
+            if day in complete:
+                print(f"[{market}] -> {day} already complete, skipping")
             else:
-                print(f"    -> no valid rows for {day}")
-                
-            time.sleep(REQUEST_DELAY_SECONDS + random.random() * 0.1)
+                incomplete_days.append(day)
+        days = incomplete_days
+
+    if not days:
+        print(f"[{market}] all days already complete.")
+        return
+
+    print(f"[{market}] processing {len(days)} day(s): {days[0]} -> {days[-1]}")
+
+    async def fetch_day(day: str) -> None:
+        recs = await fetch_funding_rates(session, limiter, market, day)
+        if not recs:
+            print(f"[{market}] no data returned for {day}")
+            return
+        batch = parse_batch(recs)
+        if not batch:
+            print(f"[{market}] no valid rows for {day}")
+            return
+        print(f"[{market}] queued {len(batch)} rows for {day}")
+        await queue.put((market, batch))
 
-        print(f"  completed {market}: {len(days)} days processed, {market_total} total rows")
+    await asyncio.gather(*(fetch_day(day) for day in days))
+
+async def write_batches(conn, queue: asyncio.Queue,
+                        bulk_markets: Set[str]) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Single writer: drain (market, rows) batches from `queue` until None, flushing every
+    UPSERT_FLUSH_ROWS and committing every COMMIT_EVERY_ROWS. Rows for `bulk_markets`
+    (no data in the DB yet) go through bulk_load_rows, the rest through upsert_rows
+    on prepared cursors held for the whole pass. DB calls run in a worker thread so
+    fetches keep going meanwhile; `conn` must be used by this writer only. Returns rows
+    written per market and the newest ts written per market; the caller publishes the
+    latter to LATEST once the transaction commits."""
+    loop = asyncio.get_running_loop()
+    market_totals: Dict[str, int] = {}
+    newest: Dict[str, int] = {}
+    pending: List[Tuple[int, str, float, float, float]] = []
+    pending_bulk: List[Tuple[int, str, float, float, float]] = []
+    uncommitted = 0
+
+    async def in_thread(fn, *args):
+        fut = loop.run_in_executor(None, fn, *args)
+        try:
+            return await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            # Don't hand the connection back (e.g. for rollback) mid-statement
+            await asyncio.wait({fut})
+            raise
+
+    async def flush(rows, write):
+        nonlocal uncommitted
+        uncommitted += await in_thread(write, conn, rows, cursors)
+        print(f"  flushed {len(rows)} rows")
+        rows.clear()
+        if uncommitted >= COMMIT_EVERY_ROWS:
+            await in_thread(conn.commit)
+            print(f"  committed {uncommitted} rows")
+            uncommitted = 0
+
+    # Prepared upsert statements live for the whole pass
+    with upsert_cursors(conn) as cursors:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            market, batch = item
+            rows, write = (pending_bulk, bulk_load_rows) if market in bulk_markets else (pending, upsert_rows)
+            rows.extend(batch)
+            market_totals[market] = market_totals.get(market, 0) + len(batch)
+            _merge_latest(newest, {market: max(row[0] for row in batch)})
+            if len(rows) >= UPSERT_FLUSH_ROWS:
+                await flush(rows, write)
+
+        if pending:
+            await flush(pending, upsert_rows)
+        if pending_bulk:
+            await flush(pending_bulk, bulk_load_rows)
+    return market_totals, newest
+
+async def run_once(conn, session: aiohttp.ClientSession, limiter: RateLimiter,
+                   force_start_date: Optional[datetime] = None) -> int:
+    today_utc = _ts_utc_now_midnight()
+    if not LATEST:
+        LATEST.update(get_latest_ts_per_market(conn))
+    latest = LATEST  # only advanced after the pass commits
+
+    # Markets are fetched concurrently (sharing one rate limiter) and push parsed
+    # batches onto a bounded queue; one writer with its own connection drains it,
+    # so HTTP and DB latency overlap while upserts stay serialized
+    queue: asyncio.Queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+    print("=" * 80)
+    # Cold-start markets cannot collide on the primary key, so skip the upsert machinery
+    bulk_markets = set() if force_start_date else {m for m in MARKETS if m not in latest}
+    write_conn = db_connect(local_infile_dir=_load_data_dir())
+    try:
+        with with_tx(write_conn):
+            writer = asyncio.create_task(write_batches(write_conn, queue, bulk_markets))
+            producers = asyncio.gather(*(process_market(session, conn, limiter, queue, market,
+                                                        latest, today_utc, force_start_date)
+                                         for market in MARKETS))
+            try:
+                # The writer only finishes before the producers if it failed; don't let
+                # producers block forever on a full queue in that case
+                await asyncio.wait({producers, writer}, return_when=asyncio.FIRST_COMPLETED)
+                if writer.done():
+                    writer.result()
+                await producers
+                # The queue may be full; if the writer dies before draining room for
+                # the sentinel, surface its error instead of waiting on the put forever
+                put = asyncio.ensure_future(queue.put(None))
+                await asyncio.wait({put, writer}, return_when=asyncio.FIRST_COMPLETED)
+                if not put.done():
+                    put.cancel()
+                    writer.result()
+                market_totals, newest = await writer
+            except BaseException:
+                producers.cancel()
+                writer.cancel()
+                await asyncio.gather(producers, writer, return_exceptions=True)
+                raise
+    finally:
+        write_conn.close()
+
+    # Only now is everything committed; a rolled-back pass must not move LATEST
+    _merge_latest(LATEST, newest)
+
+    # End the read snapshot on `conn` so later reads (e.g. the summary) see this pass
+    conn.commit()
+
+    total = sum(market_totals.values())
+    for market in MARKETS:
+        if market in market_totals:
+            print(f"  completed {market}: {market_totals[market]} total rows")
 
     print("=" * 80)
     print(f"PASS COMPLETE: {total} rows inserted/updated")
@@ -297,8 +579,14 @@ def main():
                         help='Show summary of existing data and exit')
     
     args = parser.parse_args()
-    
+    return asyncio.run(_main(args))
+
+async def _main(args) -> int:
+    if not mysql.connector.HAVE_CEXT:
+        print("Warning: mysql-connector C extension unavailable; using the pure-Python driver")
     conn = db_connect()
+    session = make_session()
+    limiter = RateLimiter(FETCH_CONCURRENCY, REQUESTS_PER_SECOND)
     try:
         if args.summary:
             show_data_summary(conn)
@@ -317,20 +605,41 @@ def main():
         
         if args.backfill_from or args.run_once:
             # Single run mode
-            changed = run_once(conn, force_start_date)
+            changed = await run_once(conn, session, limiter, force_start_date)
             print(f"Single run completed: {changed} rows processed")
             if args.backfill_from:
                 # Show summary after backfill
                 show_data_summary(conn)
         else:
-            # Continuous mode (original behavior)
-            while True:
-                changed = run_once(conn)
-                nap = SLEEP_BETWEEN_FULL_PASSES if changed == 0 else 30
-                print(f"Sleeping {nap}s...\n")
-                for _ in range(nap):
-                    time.sleep(1)
+            # Continuous mode (original behavior). SIGINT/SIGTERM end the loop after the
+            # current pass (or cut the nap short); a second signal aborts the pass.
+            shutdown = asyncio.Event()
+            main_task = asyncio.current_task()
+
+            def request_shutdown():
+                if shutdown.is_set():
+                    main_task.cancel()
+                shutdown.set()
+
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, request_shutdown)
+            try:
+                while not shutdown.is_set():
+                    changed = await run_once(conn, session, limiter)
+                    if shutdown.is_set():
+                        break
+                    nap = SLEEP_BETWEEN_FULL_PASSES if changed == 0 else 30
+                    print(f"Sleeping {nap}s...\n")
+                    try:
+                        await asyncio.wait_for(shutdown.wait(), timeout=nap)
+                    except asyncio.TimeoutError:
+                        pass
+                print("Shutdown requested; exiting.")
+            except asyncio.CancelledError:
+                print("Shutdown forced; uncommitted rows of the current pass rolled back.")
     finally:
+        await session.close()
         conn.close()
 
 if __name__ == "__main__":
@@ -6,11 +6,15 @@ CREATE TABLE IF NOT EXISTS funding_rates (
   mark_price       DOUBLE NOT NULL,       -- raw (micro) mark TWAP
   inserted_at      TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (time, market),
-  KEY market_time (market, time DESC)
+  KEY market_time (market, time)          -- ascending: MAX(time) GROUP BY market uses a loose index scan
 )
 ENGINE=InnoDB
 ROW_FORMAT=COMPRESSED
 KEY_BLOCK_SIZE=8
 -- If your FS supports page compression, you could use this instead:
 -- COMPRESSION='zlib'
-DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
\ No newline at end of file
+DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- Existing tables created with KEY market_time (market, time DESC): MySQL does not use
+-- descending key parts for MIN()/MAX(), so rebuild the key ascending:
+-- ALTER TABLE funding_rates DROP INDEX market_time, ADD INDEX market_time (market, time);